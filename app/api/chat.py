@@ -1,12 +1,26 @@
-from fastapi import APIRouter
+import asyncio
+import json
+from contextlib import AsyncExitStack
+from datetime import datetime
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from app.models.chat import (
     ChatRequest, 
     ChatResponse, 
+    BatchChatRequest,
+    BatchChatItem,
+    ChatJobResponse,
     InitializeRequest, 
     InitializeResponse,
     ChatbotConfig
 )
 from app.services.chatbot_service import chatbot_service
+from app.services.database_service import database_service
+from app.services.job_service import job_service
+
+# Seconds between SSE keepalive comments while a job is running
+SSE_KEEPALIVE_SECONDS = 15
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -35,6 +49,87 @@ async def send_message(request: ChatRequest):
         is_data_loaded=chatbot_service.is_initialized()
     )
 
+@router.post("/batch")
+async def send_batch(request: BatchChatRequest):
+    """Send many messages; results stream back as NDJSON as each one completes"""
+    # Check out the connection before the 200 is sent, so an unreachable
+    # database is a 503 rather than an empty stream
+    connection = AsyncExitStack()
+    try:
+        shared = await connection.enter_async_context(database_service.shared_connection())
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Database unavailable: {str(e)}")
+    
+    async def stream_results():
+        try:
+            async for index, message, response in chatbot_service.send_batch(
+                request.messages,
+                shared,
+                max_concurrency=request.max_concurrency
+            ):
+                item = BatchChatItem(
+                    index=index,
+                    message=message,
+                    response=response,
+                    session_id=request.session_id,
+                    timestamp=datetime.now().isoformat()
+                )
+                yield item.model_dump_json() + "\n"
+        finally:
+            await connection.aclose()
+    
+    # Also release the connection if the stream never starts; closing twice is harmless
+    return StreamingResponse(
+        stream_results(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(connection.aclose)
+    )
+
+@router.post("/jobs", response_model=ChatJobResponse, status_code=202)
+async def create_chat_job(request: ChatRequest):
+    """Queue a message to be answered in the background"""
+    try:
+        job = job_service.submit(
+            message=request.message,
+            history=request.history,
+            session_id=request.session_id
+        )
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Job queue is full, try again later")
+    
+    return ChatJobResponse(**job.to_dict())
+
+@router.get("/jobs/{job_id}", response_model=ChatJobResponse)
+async def get_chat_job(job_id: str):
+    """Get the status and result of a background job"""
+    job = job_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return ChatJobResponse(**job.to_dict())
+
+@router.get("/jobs/{job_id}/events")
+async def stream_chat_job(job_id: str):
+    """Stream job status changes over Server-Sent Events until it finishes"""
+    job = job_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def stream_events():
+        while True:
+            updated = job.updated
+            yield f"event: status\ndata: {json.dumps(job.to_dict())}\n\n"
+            if job.is_finished():
+                return
+            
+            while not updated.is_set():
+                try:
+                    await asyncio.wait_for(updated.wait(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+    
+    return StreamingResponse(stream_events(), media_type="text/event-stream")
+
 @router.get("/config", response_model=ChatbotConfig)
 async def get_chatbot_config():
     """Get chatbot configuration"""
@@ -1,13 +1,65 @@
-from fastapi import APIRouter
+import hashlib
+import json
+import re
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from app.services.database_service import database_service
+from app.config import settings
 
 router = APIRouter(prefix="/database", tags=["database"])
 
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma separated fields= column projection"""
+    if not fields:
+        return None
+    
+    columns = [field.strip() for field in fields.split(",") if field.strip()]
+    invalid = [column for column in columns if not re.fullmatch(r"\w+", column)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid field names: {', '.join(invalid)}")
+    
+    return columns or None
+
+def _check_fields(columns: List[str], available: List[str]):
+    """Reject fields= columns that are not in the result"""
+    unknown = [column for column in columns if column not in available]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+def _make_etag(*parts) -> str:
+    """Weak ETag from the given parts; weak because compression changes the bytes"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+def _is_not_modified(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match against an ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+def _cacheable_response(request: Request, content, etag: Optional[str] = None) -> Response:
+    """Return content with an ETag, or 304 when the client already has it
+    
+    Without a precomputed ETag one is derived from the content itself.
+    """
+    content = jsonable_encoder(content)
+    if etag is None:
+        etag = _make_etag(json.dumps(content, sort_keys=True, default=str))
+    
+    if _is_not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    return JSONResponse(content=content, headers={"ETag": etag})
+
 @router.get("/schema")
-async def get_database_schema():
+async def get_database_schema(request: Request):
     """Get database schema"""
     schema_data = await database_service.get_database_schema()
-    return {"schema": schema_data}
+    return _cacheable_response(request, {"schema": schema_data})
 
 @router.get("/tables/{table_name}/schema")
 async def get_table_schema(table_name: str):
@@ -16,23 +68,74 @@ async def get_table_schema(table_name: str):
     return schema
 
 @router.get("/tables/{table_name}/data")
-async def get_table_data(table_name: str, limit: int = 100):
-    """Get data from a specific table"""
-    df = await database_service.fetch_table_data(table_name, limit)
+async def get_table_data(request: Request, table_name: str, limit: int = 100, fields: Optional[str] = None):
+    """Get data from a specific table
+    
+    fields= limits the response to the given columns. When the data version
+    is tracked an unchanged result is answered with 304 before querying.
+    """
+    columns = _parse_fields(fields)
+    if columns:
+        _check_fields(columns, await database_service.get_table_columns(table_name))
+    
+    etag = None
+    data_version = database_service.get_data_version(table_name)
+    if data_version is not None:
+        etag = _make_etag(data_version, table_name, limit, columns)
+        if _is_not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+    
+    df = await database_service.fetch_table_data(table_name, limit, columns)
     data = {
         "table_name": table_name,
         "rows": len(df),
         "columns": list(df.columns),
         "data": df.to_dict('records')
     }
-    return data
+    return _cacheable_response(request, data, etag)
+
+@router.get("/search")
+async def search_incident_text(
+    q: str = Query(..., min_length=1),
+    table: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+    match_all: bool = True
+):
+    """Ranked, highlighted full-text search over incident and compliance notes"""
+    try:
+        return await database_service.search(q, table_name=table, limit=limit, match_all=match_all)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/execute-query")
-async def execute_sql_query(query: str):
-    """Execute a SQL query"""
+async def execute_sql_query(query: str, fields: Optional[str] = None):
+    """Execute a SQL query, optionally returning only the given columns"""
+    columns = _parse_fields(fields)
     results = await database_service.execute_sql_query(query)
+    
+    if columns and results.get("success"):
+        _check_fields(columns, results["columns"])
+        results["columns"] = columns
+        results["data"] = [
+            {column: row[column] for column in columns}
+            for row in results["data"]
+        ]
+    
     return results
 
+@router.post("/compliance-views/refresh")
+async def refresh_compliance_views():
+    """Refresh the compliance timeline materialized views, creating them if missing"""
+    if not settings.COMPLIANCE_VIEWS_ENABLED:
+        raise HTTPException(status_code=409, detail="Compliance views are disabled (COMPLIANCE_VIEWS_ENABLED=false)")
+    
+    try:
+        await database_service.refresh_compliance_views()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Failed to refresh compliance views: {str(e)}")
+    
+    return {"message": "Compliance views refreshed.", "success": True}
+
 @router.get("/status")
 async def get_database_status():
     """Get database status"""
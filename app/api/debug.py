@@ -0,0 +1,63 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import HTMLResponse, Response
+from app.services.profiling_service import profiling_service
+
+async def require_profiling_token(x_profiling_token: Optional[str] = Header(None)):
+    """Only allow profiling with the configured X-Profiling-Token"""
+    if not profiling_service.is_authorized(x_profiling_token):
+        raise HTTPException(status_code=403, detail="Profiling token missing or invalid")
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    dependencies=[Depends(require_profiling_token)]
+)
+
+@router.get("/slow-requests")
+async def get_slow_requests():
+    """Recent slow requests with stage timings, generated SQL and EXPLAIN plans"""
+    return {"slow_requests": profiling_service.get_slow_requests()}
+
+@router.post("/profile")
+async def profile_window(seconds: float = Query(10.0, gt=0, le=120)):
+    """Sample everything running on the event loop for a time window"""
+    try:
+        profile_id = await profiling_service.profile_window(seconds)
+    except ImportError:
+        raise HTTPException(status_code=501, detail="pyinstrument is not installed")
+    
+    return {"profile_id": profile_id, "url": f"/debug/profiles/{profile_id}"}
+
+@router.get("/profiles")
+async def list_profiles():
+    """List captured profiles"""
+    return {"profiles": profiling_service.list_profiles()}
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, format: str = Query("html", pattern="^(html|speedscope)$")):
+    """Download a captured profile as pyinstrument HTML or speedscope JSON"""
+    output = profiling_service.render_profile(profile_id, format)
+    if output is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    if format == "speedscope":
+        return Response(content=output, media_type="application/json")
+    return HTMLResponse(content=output)
+
+@router.post("/memory/start")
+async def start_memory_tracing():
+    """Start tracemalloc so data loading records memory snapshots"""
+    profiling_service.start_memory_tracing()
+    return {"tracing": True}
+
+@router.post("/memory/stop")
+async def stop_memory_tracing():
+    """Stop tracemalloc"""
+    profiling_service.stop_memory_tracing()
+    return {"tracing": False}
+
+@router.get("/memory")
+async def get_memory_snapshots():
+    """Memory diffs recorded around fetch_all_tables_data and dataframes_to_csv_string"""
+    return profiling_service.get_memory_snapshots()
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from datetime import datetime
+from app.services.startup_service import startup_service
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -11,3 +13,24 @@ async def health_check():
         "timestamp": datetime.now().isoformat(),
         "version": "1.0.0"
     }
+
+@router.get("/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving requests"""
+    return {
+        "status": "alive",
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until the warm-up has loaded the chatbot data"""
+    ready = startup_service.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "warming_up",
+            "stages": startup_service.get_progress(),
+            "timestamp": datetime.now().isoformat()
+        }
+    )
@@ -14,6 +14,10 @@ class Settings:
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
     
+    # Response compression
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "500"))
+    
     # Database settings
     DB_HOST: str = os.getenv("DB_HOST", "localhost")
     DB_PORT: int = int(os.getenv("DB_PORT", "5432"))
@@ -21,10 +25,44 @@ class Settings:
     DB_USER: str = os.getenv("DB_USER", "postgres")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "")
     
+    # Startup warm-up
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    DB_POOL_WARM_CONNECTIONS: int = int(os.getenv("DB_POOL_WARM_CONNECTIONS", "2"))
+    WARMUP_RETRY_SECONDS: float = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+    
+    # Live refresh via Postgres LISTEN/NOTIFY
+    DB_LISTEN_ENABLED: bool = os.getenv("DB_LISTEN_ENABLED", "false").lower() == "true"
+    DB_LISTEN_INSTALL_TRIGGERS: bool = os.getenv("DB_LISTEN_INSTALL_TRIGGERS", "true").lower() == "true"
+    DB_LISTEN_CHANNEL: str = os.getenv("DB_LISTEN_CHANNEL", "chatbot_data_changes")
+    DB_LISTEN_DEBOUNCE_SECONDS: float = float(os.getenv("DB_LISTEN_DEBOUNCE_SECONDS", "1.0"))
+    DB_LISTEN_RECONNECT_SECONDS: float = float(os.getenv("DB_LISTEN_RECONNECT_SECONDS", "5.0"))
+    
+    # Compliance timeline materialized views
+    COMPLIANCE_VIEWS_ENABLED: bool = os.getenv("COMPLIANCE_VIEWS_ENABLED", "true").lower() == "true"
+    COMPLIANCE_VIEW_REFRESH_SECONDS: float = float(os.getenv("COMPLIANCE_VIEW_REFRESH_SECONDS", "300"))
+    
+    # Full-text search indexes
+    SEARCH_INDEXES_ENABLED: bool = os.getenv("SEARCH_INDEXES_ENABLED", "true").lower() == "true"
+    
+    # Profiling; the debug endpoints and X-Profile header need PROFILING_TOKEN
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_INTERVAL_SECONDS: float = float(os.getenv("PROFILING_INTERVAL_SECONDS", "0.001"))
+    PROFILING_MAX_RECORDS: int = int(os.getenv("PROFILING_MAX_RECORDS", "50"))
+    SLOW_REQUEST_THRESHOLD_MS: float = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "5000"))
+    
     # Chatbot settings
     CHATBOT_NAME: str = os.getenv("CHATBOT_NAME", "Simple Chatbot")
     CHATBOT_DESCRIPTION: str = os.getenv("CHATBOT_DESCRIPTION", "A simple chatbot")
     
+    # Batch chat settings
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+    BATCH_MAX_MESSAGES: int = int(os.getenv("BATCH_MAX_MESSAGES", "100"))
+    
+    # Background job settings
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_QUEUE_MAX_SIZE: int = int(os.getenv("JOB_QUEUE_MAX_SIZE", "100"))
+    JOB_RESULT_TTL_SECONDS: int = int(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+    
     def get_db_url(self) -> str:
         """Get database URL"""
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
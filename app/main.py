@@ -1,14 +1,46 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.api import chat, health, database
+from app.middleware import CompressionMiddleware, ProfilingMiddleware
+from app.api import chat, health, database, debug
+from app.services.job_service import job_service
+from app.services.chatbot_service import chatbot_service
+from app.services.database_service import database_service
+from app.services.startup_service import startup_service
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background work without blocking startup, and stop it on shutdown"""
+    if settings.WARMUP_ENABLED:
+        startup_service.start()
+    
+    if settings.SEARCH_INDEXES_ENABLED:
+        await database_service.start_search_index_build()
+    
+    if settings.COMPLIANCE_VIEWS_ENABLED:
+        await database_service.start_compliance_view_refresher()
+    
+    if settings.DB_LISTEN_ENABLED:
+        database_service.add_change_listener(chatbot_service.apply_data_changes)
+        if settings.COMPLIANCE_VIEWS_ENABLED:
+            database_service.add_change_listener(lambda changes: database_service.refresh_compliance_views())
+        await database_service.start_change_listener()
+    
+    yield
+    
+    await startup_service.stop()
+    await job_service.stop()
+    await database_service.stop_change_listener()
+    await database_service.stop_compliance_view_refresher()
 
 # Create FastAPI app
 app = FastAPI(
     title="Simple Chatbot API",
     description="A simple chatbot API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Allow all origins for CORS
@@ -20,10 +52,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Trace requests for the slow-request log and on-demand profiles
+app.add_middleware(ProfilingMiddleware)
+
+# Compress responses above a size threshold
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
 # Include routers
 app.include_router(health.router)
 app.include_router(chat.router)
 app.include_router(database.router)
+app.include_router(debug.router)
 
 @app.get("/")
 async def root():
@@ -0,0 +1,81 @@
+import uuid
+from starlette.middleware.gzip import GZipMiddleware
+
+# Streaming endpoints are sent uncompressed so each item reaches the client
+# as soon as it is written instead of waiting in the compressor's buffer
+UNCOMPRESSED_PATH_SUFFIXES = ("/chat/batch", "/events")
+
+# Streams and the profiling endpoints are slow by design; logging them would
+# push real slow requests out of the slow-request log
+UNLOGGED_PATH_PREFIXES = ("/debug",)
+
+
+class CompressionMiddleware:
+    """Brotli or gzip response compression above a minimum size
+    
+    Brotli is used when the optional brotli-asgi package is installed,
+    falling back to gzip for clients that do not accept it.
+    """
+    
+    def __init__(self, app, minimum_size: int = 500):
+        self.app = app
+        try:
+            from brotli_asgi import BrotliMiddleware
+            self.compressed_app = BrotliMiddleware(app, minimum_size=minimum_size, gzip_fallback=True)
+        except ImportError:
+            self.compressed_app = GZipMiddleware(app, minimum_size=minimum_size)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not scope["path"].rstrip("/").endswith(UNCOMPRESSED_PATH_SUFFIXES):
+            await self.compressed_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+class ProfilingMiddleware:
+    """Traces every request for the slow-request log, except streams and /debug
+    
+    Requests sending "X-Profile: 1" with a valid X-Profiling-Token are also
+    sampled with pyinstrument; the response carries an X-Profile-Id header
+    naming the stored profile.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        from app.services.profiling_service import profiling_service
+        
+        headers = dict(scope["headers"])
+        label = f"{scope['method']} {scope['path']}"
+        token = headers.get(b"x-profiling-token", b"").decode("latin-1")
+        wants_profile = headers.get(b"x-profile") == b"1" and profiling_service.is_authorized(token)
+        path = scope["path"].rstrip("/")
+        log_slow = not (path.endswith(UNCOMPRESSED_PATH_SUFFIXES) or path.startswith(UNLOGGED_PATH_PREFIXES))
+        
+        async with profiling_service.trace(label, log_slow=log_slow) as trace:
+            profile_id = uuid.uuid4().hex if wants_profile else None
+            
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    trace.status_code = message["status"]
+                    if profile_id:
+                        message["headers"] = list(message.get("headers", [])) + [
+                            (b"x-profile-id", profile_id.encode())
+                        ]
+                await send(message)
+            
+            if not profile_id:
+                await self.app(scope, receive, send_wrapper)
+                return
+            
+            profiler = profiling_service.start_request_profiler()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.stop()
+                profiling_service.store_profile(profile_id, label, profiler)
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
+from app.config import settings
 
 class Message(BaseModel):
     """Simple message model"""
@@ -26,6 +27,32 @@ class ChatResponse(BaseModel):
     timestamp: str = datetime.now().isoformat()
     is_data_loaded: bool = True
 
+class BatchChatRequest(BaseModel):
+    """Batch chat request"""
+    messages: List[str] = Field(..., min_length=1, max_length=settings.BATCH_MAX_MESSAGES)
+    session_id: Optional[str] = None
+    max_concurrency: Optional[int] = Field(None, ge=1, le=32)
+
+class BatchChatItem(BaseModel):
+    """One streamed result of a batch chat request"""
+    index: int
+    message: str
+    response: str
+    session_id: Optional[str] = None
+    timestamp: str
+
+class ChatJobResponse(BaseModel):
+    """Status and result of a background chat job"""
+    job_id: str
+    status: str
+    message: str
+    response: Optional[str] = None
+    error: Optional[str] = None
+    session_id: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
 class InitializeRequest(BaseModel):
     """Simple initialize request"""
     session_id: Optional[str] = None
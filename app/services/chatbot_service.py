@@ -1,16 +1,25 @@
+import asyncio
 import re
-from typing import List, Optional
-from app.services.gemini_service import gemini_service
-from app.services.database_service import database_service
+from typing import AsyncIterator, List, Optional, Tuple
+from app.services.gemini_service import gemini_service, GeminiError
+from app.services.database_service import database_service, SharedConnection, TABLE_KEYS
+from app.services.query_template_service import query_template_service
+from app.services.profiling_service import profiling_service
 from app.models.chat import ChatHistory
 from app.config import settings
 
+class ChatbotError(Exception):
+    """A message could not be answered, e.g. the generated SQL failed"""
+
 class ChatbotService:
     """Simple chatbot service"""
     
     def __init__(self):
         self._database_data = None
+        self._dataframes = None
+        self._schema_data = None
         self._is_initialized = False
+        self._init_lock = asyncio.Lock()
     
     def _extract_sql_query(self, text: str) -> Optional[str]:
         """Extract SQL query from AI response"""
@@ -55,67 +64,169 @@ class ChatbotService:
         
         return f"Query Results ({row_count} rows):\n\n{table}"
     
-    async def initialize(self) -> str:
-        """Initialize the chatbot"""
-        if self._is_initialized:
-            return "Chatbot is ready!"
+    async def _answer_from_template(self, user_message: str,
+                                    shared: Optional[SharedConnection] = None) -> Optional[str]:
+        """Run a templated query for the message, or None to fall back to the LLM"""
+        with profiling_service.stage("template_match"):
+            match = query_template_service.match(user_message)
+        if not match:
+            return None
+
+        params = dict(match.params)
+        for name, (table_name, column) in match.known_values.items():
+            values = await database_service.get_distinct_values(table_name, column)
+            known = {str(value).lower(): value for value in values}
+            if str(params[name]).lower() not in known:
+                # Not a value in the data; let the LLM interpret it
+                return None
+            params[name] = known[str(params[name]).lower()]
+
+        profiling_service.record_sql(match.sql, params)
+        with profiling_service.stage("sql_execute"):
+            query_results = await database_service.execute_sql_query(match.sql, params, shared=shared)
+        if not query_results.get("success"):
+            return None
+        if match.fallback_on_empty and not query_results.get("row_count"):
+            return None
+        if match.fallback_on_zero and query_results.get("row_count") == 1 and not any(query_results["data"][0].values()):
+            return None
+
+        return self._format_query_results(query_results)
+    
+    async def _load_snapshot(self):
+        """Fetch the table data and build the CSV used in the prompt"""
+        with profiling_service.stage("fetch_all_tables_data", trace_memory=True):
+            self._dataframes = await database_service.fetch_all_tables_data()
+        with profiling_service.stage("dataframes_to_csv_string", trace_memory=True):
+            self._database_data = database_service.dataframes_to_csv_string(self._dataframes)
+    
+    async def initialize(self, schema_data: Optional[str] = None) -> str:
+        """Initialize the chatbot
         
-        try:
-            # Get database data
-            dataframes = await database_service.fetch_all_tables_data()
-            self._database_data = database_service.dataframes_to_csv_string(dataframes)
-            
-            # Get database schema
-            schema_data = await database_service.get_database_schema()
-            
-            # Set data in Gemini service
-            gemini_service.set_database_data(self._database_data, schema_data)
+        Concurrent callers wait for the first one instead of fetching again.
+        A schema already fetched by the caller can be passed in.
+        """
+        async with self._init_lock:
+            if self._is_initialized:
+                return "Chatbot is ready!"
             
-            self._is_initialized = True
-            return "Chatbot is ready!"
-            
-        except Exception as e:
-            return f"Failed to initialize: {str(e)}"
+            try:
+                # Get database data
+                await self._load_snapshot()
+                
+                # Get database schema
+                self._schema_data = schema_data or await database_service.get_database_schema()
+                
+                # Set data in Gemini service
+                gemini_service.set_database_data(self._database_data, self._schema_data)
+                
+                self._is_initialized = True
+                return "Chatbot is ready!"
+                
+            except Exception as e:
+                return f"Failed to initialize: {str(e)}"
     
-    async def send_message(self, user_message: str, history: Optional[List] = None) -> str:
+    async def send_message(self, user_message: str, history: Optional[List] = None,
+                           shared: Optional[SharedConnection] = None) -> str:
         """Send a message to the chatbot"""
         try:
-            # Initialize if not done
-            if not self._is_initialized:
-                await self.initialize()
-            
-            # Convert history to Gemini format
-            gemini_history = []
-            if history:
-                gemini_history = gemini_service.convert_messages_to_gemini_format(history)
-            
-            # Add user message
-            gemini_history.append(ChatHistory(
-                role="user",
-                parts=[{"text": user_message}]
-            ))
-            
-            # Get response from Gemini
-            response = await gemini_service.generate_response(gemini_history)
-            print("THE REPSPOSNE FROM THE GOOGLE",response)
-            # Check if response contains SQL query
-            sql_query = self._extract_sql_query(response)
-            
-            if sql_query:
-                # Execute the SQL query
-                query_results = await database_service.execute_sql_query(sql_query)
-                results_text = self._format_query_results(query_results)
-                return results_text
-            
-            return response
-            
+            return await self.answer_message(user_message, history, shared)
+        except (ChatbotError, GeminiError) as e:
+            return str(e)
         except Exception as e:
             return f"Error: {str(e)}"
     
+    async def answer_message(self, user_message: str, history: Optional[List] = None,
+                             shared: Optional[SharedConnection] = None) -> str:
+        """Answer a message, raising instead of returning error text"""
+        # Answer common question shapes directly without calling Gemini.
+        # Follow-ups can refer back to earlier turns, so they always go to the LLM.
+        if not history:
+            template_answer = await self._answer_from_template(user_message, shared)
+            if template_answer is not None:
+                return template_answer
+
+        # Initialize if not done
+        if not self._is_initialized:
+            with profiling_service.stage("initialize"):
+                await self.initialize()
+        
+        # Convert history to Gemini format
+        gemini_history = []
+        if history:
+            gemini_history = gemini_service.convert_messages_to_gemini_format(history)
+        
+        # Add user message
+        gemini_history.append(ChatHistory(
+            role="user",
+            parts=[{"text": user_message}]
+        ))
+        
+        # Get response from Gemini
+        with profiling_service.stage("gemini"):
+            response = await gemini_service.request_response(gemini_history)
+        print("THE REPSPOSNE FROM THE GOOGLE",response)
+        # Check if response contains SQL query
+        sql_query = self._extract_sql_query(response)
+        
+        if sql_query:
+            # Execute the SQL query
+            profiling_service.record_sql(sql_query)
+            with profiling_service.stage("sql_execute"):
+                query_results = await database_service.execute_sql_query(sql_query, shared=shared)
+            if not query_results.get("success"):
+                raise ChatbotError(self._format_query_results(query_results))
+            results_text = self._format_query_results(query_results)
+            return results_text
+        
+        return response
+    
+    async def send_batch(self, messages: List[str], shared: SharedConnection,
+                         max_concurrency: Optional[int] = None) -> AsyncIterator[Tuple[int, str, str]]:
+        """Answer many messages, yielding (index, message, response) as each completes
+        
+        Identical messages are answered once. Gemini calls run with bounded
+        concurrency while generated SQL runs on the caller's shared connection.
+        """
+        # Initialize once up front rather than racing inside every task
+        if not self._is_initialized:
+            await self.initialize()
+        
+        unique_messages = {}
+        for index, message in enumerate(messages):
+            unique_messages.setdefault(message.strip(), []).append(index)
+        
+        semaphore = asyncio.Semaphore(max_concurrency or settings.BATCH_MAX_CONCURRENCY)
+        
+        async def answer(message: str, indexes: List[int]):
+            async with semaphore:
+                response = await self.send_message(message, shared=shared)
+            return message, indexes, response
+        
+        tasks = [
+            asyncio.create_task(answer(message, indexes))
+            for message, indexes in unique_messages.items()
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                message, indexes, response = await next_done
+                for index in indexes:
+                    yield index, message, response
+        finally:
+            # Stop outstanding work if the client goes away mid-stream, and
+            # wait for it so nothing still uses the shared connection
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
     def is_initialized(self) -> bool:
         """Check if chatbot is initialized"""
         return self._is_initialized
     
+    def get_missing_tables(self) -> List[str]:
+        """Tables that failed to load into the snapshot"""
+        return [table_name for table_name in TABLE_KEYS if table_name not in (self._dataframes or {})]
+    
     def get_config(self) -> dict:
         """Get chatbot configuration"""
         return {
@@ -126,16 +237,34 @@ class ChatbotService:
     async def reload_data(self) -> str:
         """Reload the data"""
         try:
-            dataframes = await database_service.fetch_all_tables_data()
-            self._database_data = database_service.dataframes_to_csv_string(dataframes)
+            await self._load_snapshot()
             
-            schema_data = await database_service.get_database_schema()
-            gemini_service.set_database_data(self._database_data, schema_data)
+            self._schema_data = await database_service.get_database_schema()
+            gemini_service.set_database_data(self._database_data, self._schema_data)
             
             return "Data reloaded successfully."
             
         except Exception as e:
             return f"Failed to reload data: {str(e)}"
+    
+    async def apply_data_changes(self, changes: Optional[dict]):
+        """Apply changed rows from the database change listener to the snapshot
+        
+        Waits for an initialize in progress, whose snapshot may have been read
+        before these changes; applying a change twice is harmless.
+        """
+        async with self._init_lock:
+            if not self._is_initialized:
+                # The next initialize fetches fresh data anyway
+                return
+            
+            if changes is None:
+                await self.reload_data()
+                return
+            
+            self._dataframes = database_service.apply_changes_to_dataframes(self._dataframes, changes)
+            self._database_data = database_service.dataframes_to_csv_string(self._dataframes)
+            gemini_service.set_database_data(self._database_data, self._schema_data)
 
 # Create service instance
 chatbot_service = ChatbotService()
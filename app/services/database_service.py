@@ -1,38 +1,247 @@
-import pandas as pd
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy import text
+import asyncio
+import json
+import logging
+import re
+import time
+import uuid
+from contextlib import asynccontextmanager
 from app.config import settings
 
+# pandas and SQLAlchemy are imported on first use to keep app startup fast
+
+logger = logging.getLogger(__name__)
+
+def text(sql: str):
+    """Build a SQLAlchemy text clause"""
+    from sqlalchemy import text as sql_text
+    return sql_text(sql)
+
+# Tables loaded into the chatbot snapshot, with their primary key column
+TABLE_KEYS = {
+    "fall_incidents_primary": "ID",
+    "fall_compliance_events": "EVENT_ID",
+}
+
+# Rows per table kept in the chatbot snapshot
+SNAPSHOT_ROW_LIMIT = 100
+
+# Seconds the distinct values of a column are reused before querying again
+DISTINCT_VALUES_TTL_SECONDS = 300
+
+# Materialized views with per-event and per-incident compliance timelines.
+# Each needs a unique index so it can be refreshed concurrently.
+COMPLIANCE_VIEWS = {
+    "fall_compliance_timeline": {
+        "description": (
+            "One row per compliance event joined to its incident, with "
+            "LATENESS_MINUTES = ACTUAL_TIMESTAMP - SCHEDULED_TIMESTAMP and a LATENESS_BUCKET "
+            "(UNSCHEDULED, MISSING, ON_TIME, LATE_UNDER_1H, LATE_1_TO_4H, LATE_4_TO_24H, LATE_OVER_24H)"
+        ),
+        "unique_column": "EVENT_ID",
+        "sql": """
+            SELECT
+                e."EVENT_ID",
+                e."INCIDENT_ID",
+                COALESCE(i."NAME", e."NAME") AS "NAME",
+                i."FLOOR",
+                i."DATE" AS "INCIDENT_DATE",
+                e."EVENT_TYPE",
+                e."EVENT_SEQUENCE",
+                e."EVENT_STATUS",
+                e."SCHEDULED_TIMESTAMP",
+                e."ACTUAL_TIMESTAMP",
+                EXTRACT(EPOCH FROM (e."ACTUAL_TIMESTAMP" - e."SCHEDULED_TIMESTAMP")) / 60 AS "LATENESS_MINUTES",
+                CASE
+                    WHEN e."SCHEDULED_TIMESTAMP" IS NULL THEN 'UNSCHEDULED'
+                    WHEN e."ACTUAL_TIMESTAMP" IS NULL THEN 'MISSING'
+                    WHEN e."ACTUAL_TIMESTAMP" <= e."SCHEDULED_TIMESTAMP" THEN 'ON_TIME'
+                    WHEN e."ACTUAL_TIMESTAMP" - e."SCHEDULED_TIMESTAMP" <= INTERVAL '1 hour' THEN 'LATE_UNDER_1H'
+                    WHEN e."ACTUAL_TIMESTAMP" - e."SCHEDULED_TIMESTAMP" <= INTERVAL '4 hours' THEN 'LATE_1_TO_4H'
+                    WHEN e."ACTUAL_TIMESTAMP" - e."SCHEDULED_TIMESTAMP" <= INTERVAL '24 hours' THEN 'LATE_4_TO_24H'
+                    ELSE 'LATE_OVER_24H'
+                END AS "LATENESS_BUCKET",
+                i."NON_COMPLIANCE_FLAG",
+                e."NURSENAME"
+            FROM fall_compliance_events e
+            LEFT JOIN fall_incidents_primary i ON i."ID" = e."INCIDENT_ID"
+        """,
+    },
+    "fall_compliance_incident_summary": {
+        "description": (
+            "One row per incident rolling up fall_compliance_timeline: event counts per "
+            "lateness category, max/avg lateness in minutes and NON_COMPLIANCE_FLAG"
+        ),
+        "unique_column": "INCIDENT_ID",
+        "sql": """
+            SELECT
+                "INCIDENT_ID",
+                MAX("NAME") AS "NAME",
+                MAX("FLOOR") AS "FLOOR",
+                MIN("INCIDENT_DATE") AS "INCIDENT_DATE",
+                COUNT(*) AS "EVENT_COUNT",
+                COUNT(*) FILTER (WHERE "LATENESS_BUCKET" = 'ON_TIME') AS "ON_TIME_COUNT",
+                COUNT(*) FILTER (WHERE "LATENESS_BUCKET" LIKE 'LATE%') AS "LATE_COUNT",
+                COUNT(*) FILTER (WHERE "LATENESS_BUCKET" = 'MISSING') AS "MISSING_COUNT",
+                MAX("LATENESS_MINUTES") AS "MAX_LATENESS_MINUTES",
+                AVG("LATENESS_MINUTES") FILTER (WHERE "LATENESS_MINUTES" > 0) AS "AVG_LATENESS_MINUTES",
+                BOOL_OR(COALESCE("NON_COMPLIANCE_FLAG", FALSE)) AS "NON_COMPLIANCE_FLAG"
+            FROM fall_compliance_timeline
+            WHERE "INCIDENT_ID" IS NOT NULL
+            GROUP BY "INCIDENT_ID"
+        """,
+    },
+}
+
+# Free-text columns covered by the full-text search index of each table
+SEARCH_COLUMNS = {
+    "fall_incidents_primary": [
+        "POSTFALLNOTES", "INTERVENTIONS", "CAUSE", "INJURIES",
+        "INCIDENT_LOCATION", "HIR_FOLLOWUPS",
+    ],
+    "fall_compliance_events": ["EVENT_DETAILS"],
+}
+
+SEARCH_LANGUAGE = "english"
+
+SEARCH_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5"
+
+def search_document_sql(table_name: str) -> str:
+    """SQL expression concatenating the searchable text of a table"""
+    return " || ' ' || ".join(f"coalesce(\"{column}\", '')" for column in SEARCH_COLUMNS[table_name])
+
+def search_vector_sql(table_name: str) -> str:
+    """tsvector expression matching the table's GIN search index"""
+    return f"to_tsvector('{SEARCH_LANGUAGE}', {search_document_sql(table_name)})"
+
+# Trigger function that publishes the key of every changed row
+CHANGE_NOTIFY_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION notify_chatbot_data_change() RETURNS trigger AS $$
+DECLARE
+    row_data json;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_data := row_to_json(OLD);
+    ELSE
+        row_data := row_to_json(NEW);
+    END IF;
+    PERFORM pg_notify(
+        TG_ARGV[1],
+        json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'id', row_data->TG_ARGV[0])::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# TRUNCATE fires no row triggers, so a statement trigger asks for a full reload
+TRUNCATE_NOTIFY_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION notify_chatbot_data_truncate() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        TG_ARGV[0],
+        json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'id', NULL)::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Triggers that must exist on every snapshot table for change tracking
+CHANGE_TRIGGER_NAMES = ("chatbot_notify_change", "chatbot_notify_truncate")
+
+class SharedConnection:
+    """One pooled connection reused by many queries, one query at a time"""
+    
+    def __init__(self, conn):
+        self.conn = conn
+        self.lock = asyncio.Lock()
+
 class DatabaseService:
     """Simple database service"""
     
     def __init__(self):
         self.db_url = settings.get_db_url()
         self.engine = None
+        self._change_listeners = []
+        self._listen_task = None
+        self._flush_task = None
+        self._pending_changes = {}
+        self._full_reload_pending = False
+        self._column_cache = {}
+        self._distinct_cache = {}
+        # Bumped on every change notification; only trustworthy while listening
+        # and the triggers are confirmed to exist
+        self._data_version_epoch = uuid.uuid4().hex[:8]
+        self._data_version = 0
+        self._listening = False
+        self._triggers_verified = False
+        self._refresh_task = None
+        self._search_index_task = None
+        self._refresh_lock = asyncio.Lock()
     
     async def connect(self):
         """Connect to database"""
         if not self.engine:
+            from sqlalchemy.ext.asyncio import create_async_engine
             self.engine = create_async_engine(self.db_url)
     
+    async def _fetch_columns(self, conn, table_name: str) -> list:
+        """Get the name and type of each column of a table or view"""
+        # pg_attribute also covers materialized views, unlike information_schema
+        result = await conn.execute(text("""
+            SELECT a.attname, format_type(a.atttypid, a.atttypmod)
+            FROM pg_attribute a
+            JOIN pg_class c ON c.oid = a.attrelid
+            WHERE c.relname = :table_name
+              AND pg_table_is_visible(c.oid)
+              AND a.attnum > 0
+              AND NOT a.attisdropped
+            ORDER BY a.attnum
+        """), {"table_name": table_name})
+        
+        columns = []
+        for row in result.fetchall():
+            columns.append({
+                "name": row[0],
+                "type": row[1]
+            })
+        return columns
+    
+    async def get_table_columns(self, table_name: str) -> list:
+        """Get the column names of a table, cached after the first lookup"""
+        if table_name not in self._column_cache:
+            await self.connect()
+            async with self.engine.begin() as conn:
+                columns = await self._fetch_columns(conn, table_name)
+            if not columns:
+                # Unknown table; don't cache so it is found once created
+                return []
+            self._column_cache[table_name] = [column["name"] for column in columns]
+        
+        return self._column_cache[table_name]
+    
+    async def get_distinct_values(self, table_name: str, column: str) -> list:
+        """Get the distinct non-null values of a column, cached for a while"""
+        key = (table_name, column)
+        cached = self._distinct_cache.get(key)
+        if cached is None or time.monotonic() - cached[0] > DISTINCT_VALUES_TTL_SECONDS:
+            await self.connect()
+            async with self.engine.connect() as conn:
+                result = await conn.execute(text(
+                    f'SELECT DISTINCT "{column}" FROM "{table_name}" WHERE "{column}" IS NOT NULL'
+                ))
+                values = [row[0] for row in result]
+            cached = (time.monotonic(), values)
+            self._distinct_cache[key] = cached
+        
+        return cached[1]
+    
     async def get_table_schema(self, table_name: str):
         """Get schema for a table"""
         await self.connect()
         async with self.engine.begin() as conn:
             # Get column info
-            result = await conn.execute(text("""
-                SELECT column_name, data_type
-                FROM information_schema.columns 
-                WHERE table_name = :table_name
-                ORDER BY ordinal_position
-            """), {"table_name": table_name})
-            
-            columns = []
-            for row in result.fetchall():
-                columns.append({
-                    "name": row[0],
-                    "type": row[1]
-                })
+            columns = await self._fetch_columns(conn, table_name)
             
             # Get row count
             count_result = await conn.execute(text(f'SELECT COUNT(*) FROM "{table_name}"'))
@@ -44,16 +253,18 @@ class DatabaseService:
                 "row_count": row_count
             }
     
-    async def get_database_schema(self):
-        """Get database schema"""
+    async def get_database_schema(self, strict: bool = False):
+        """Get database schema
+        
+        With strict, a table whose schema cannot be read raises instead of
+        being listed with its error.
+        """
         schema_info = []
         schema_info.append("DATABASE SCHEMA:")
         schema_info.append("=" * 30)
         
         # Add table schemas
-        tables = ["fall_incidents_primary", "fall_compliance_events"]
-        
-        for table_name in tables:
+        for table_name in TABLE_KEYS:
             try:
                 schema = await self.get_table_schema(table_name)
                 schema_info.append(f"\nTABLE: {schema['table_name']}")
@@ -64,29 +275,95 @@ class DatabaseService:
                     schema_info.append(f"  {column['name']}: {column['type']}")
                 
             except Exception as e:
+                if strict:
+                    raise
                 schema_info.append(f"\nTABLE: {table_name} - Error: {str(e)}")
         
+        # Describe how to use the full-text search indexes that are ready
+        try:
+            index_validity = await self.get_search_index_validity()
+        except Exception:
+            index_validity = {}
+        searchable = [table_name for table_name in SEARCH_COLUMNS if index_validity.get(table_name)]
+        if searchable:
+            schema_info.append("\nFULL-TEXT SEARCH (indexed, use instead of ILIKE '%...%'):")
+            for table_name in searchable:
+                schema_info.append(
+                    f"  {table_name}: WHERE {search_vector_sql(table_name)} "
+                    f"@@ websearch_to_tsquery('{SEARCH_LANGUAGE}', 'search terms')"
+                )
+        
+        # Add compliance views when they exist
+        if settings.COMPLIANCE_VIEWS_ENABLED:
+            for view_name, view in COMPLIANCE_VIEWS.items():
+                try:
+                    schema = await self.get_table_schema(view_name)
+                except Exception:
+                    continue
+                if not schema['columns']:
+                    continue
+                
+                schema_info.append(f"\nMATERIALIZED VIEW: {view_name}")
+                schema_info.append(f"DESCRIPTION: {view['description']}")
+                schema_info.append(f"ROWS: {schema['row_count']}")
+                schema_info.append("COLUMNS:")
+                
+                for column in schema['columns']:
+                    schema_info.append(f"  {column['name']}: {column['type']}")
+        
         return "\n".join(schema_info)
     
-    async def execute_sql_query(self, sql_query: str):
-        """Execute SQL query"""
+    async def warm_pool(self, connections: int):
+        """Open pooled connections ahead of the first request"""
+        await self.connect()
+        
+        async def ping():
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        
+        # Concurrent pings force the pool to open distinct connections
+        await asyncio.gather(*[ping() for _ in range(connections)])
+    
+    @asynccontextmanager
+    async def shared_connection(self):
+        """Check out a single pooled connection to reuse across many queries"""
+        await self.connect()
+        async with self.engine.connect() as conn:
+            yield SharedConnection(conn)
+    
+    def _result_to_dict(self, result) -> dict:
+        """Convert a query result into the response format"""
+        columns = result.keys()
+        rows = result.fetchall()
+        
+        data = []
+        for row in rows:
+            data.append(dict(zip(columns, row)))
+        
+        return {
+            "success": True,
+            "data": data,
+            "columns": list(columns),
+            "row_count": len(data)
+        }
+    
+    async def execute_sql_query(self, sql_query: str, params: dict = None, shared: SharedConnection = None):
+        """Execute SQL query, binding params when given
+        
+        When a shared connection is passed the query runs on it instead of
+        checking out a new connection from the pool.
+        """
         await self.connect()
         try:
+            if shared is not None:
+                async with shared.lock:
+                    async with shared.conn.begin():
+                        result = await shared.conn.execute(text(sql_query), params or {})
+                        return self._result_to_dict(result)
+            
             async with self.engine.begin() as conn:
-                result = await conn.execute(text(sql_query))
-                columns = result.keys()
-                rows = result.fetchall()
-                
-                data = []
-                for row in rows:
-                    data.append(dict(zip(columns, row)))
-                
-                return {
-                    "success": True,
-                    "data": data,
-                    "columns": list(columns),
-                    "row_count": len(data)
-                }
+                result = await conn.execute(text(sql_query), params or {})
+                return self._result_to_dict(result)
                 
         except Exception as e:
             return {
@@ -94,10 +371,13 @@ class DatabaseService:
                 "error": str(e)
             }
     
-    async def fetch_table_data(self, table_name: str, limit: int = 100):
-        """Fetch data from table"""
+    async def fetch_table_data(self, table_name: str, limit: int = 100, columns: list = None):
+        """Fetch data from table, optionally only the given columns"""
+        import pandas as pd
+        
         await self.connect()
-        query = f'SELECT * FROM "{table_name}" LIMIT {limit}'
+        select_list = ", ".join(f'"{column}"' for column in columns) if columns else "*"
+        query = f'SELECT {select_list} FROM "{table_name}" LIMIT {limit}'
         
         async with self.engine.begin() as conn:
             result = await conn.execute(text(query))
@@ -112,11 +392,9 @@ class DatabaseService:
         await self.connect()
         all_data = {}
         
-        tables = ["fall_incidents_primary", "fall_compliance_events"]
-        
-        for table_name in tables:
+        for table_name in TABLE_KEYS:
             try:
-                df = await self.fetch_table_data(table_name, 100)
+                df = await self.fetch_table_data(table_name, SNAPSHOT_ROW_LIMIT)
                 all_data[table_name] = df
             except Exception as e:
                 print(f"Error fetching {table_name}: {str(e)}")
@@ -142,6 +420,402 @@ class DatabaseService:
             csv_strings.append("\n" + "=" * 30 + "\n")
         
         return "\n".join(csv_strings)
+    
+    async def fetch_rows_by_key(self, table_name: str, ids: list):
+        """Fetch the current rows of a table for the given primary keys"""
+        import pandas as pd
+        
+        await self.connect()
+        key = TABLE_KEYS[table_name]
+        query = f'SELECT * FROM "{table_name}" WHERE "{key}" = ANY(:ids)'
+        
+        async with self.engine.begin() as conn:
+            result = await conn.execute(text(query), {"ids": list(ids)})
+            rows = result.fetchall()
+            columns = result.keys()
+            
+            return pd.DataFrame(rows, columns=columns)
+    
+    def apply_changes_to_dataframes(self, dataframes: dict, changes: dict) -> dict:
+        """Apply changed rows to snapshot DataFrames
+        
+        Rows already in the snapshot are replaced or removed, new rows are
+        appended while the table is under SNAPSHOT_ROW_LIMIT.
+        """
+        import pandas as pd
+        
+        updated = dict(dataframes)
+        
+        for table_name, change in changes.items():
+            df = updated.get(table_name)
+            rows = change["rows"]
+            if df is None or df.empty:
+                updated[table_name] = rows.head(SNAPSHOT_ROW_LIMIT)
+                continue
+            
+            key = TABLE_KEYS[table_name]
+            changed = df[key].isin(change["ids"])
+            kept = df[~changed]
+            present_ids = set(df.loc[changed, key])
+            
+            replaced_rows = rows[rows[key].isin(present_ids)]
+            new_rows = rows[~rows[key].isin(present_ids)]
+            room = max(SNAPSHOT_ROW_LIMIT - len(kept) - len(replaced_rows), 0)
+            
+            updated[table_name] = pd.concat(
+                [kept, replaced_rows, new_rows.head(room)],
+                ignore_index=True
+            )
+        
+        return updated
+    
+    async def create_compliance_views(self):
+        """Create the compliance materialized views and their unique indexes"""
+        await self.connect()
+        async with self.engine.begin() as conn:
+            for view_name, view in COMPLIANCE_VIEWS.items():
+                await conn.execute(text(
+                    f'CREATE MATERIALIZED VIEW IF NOT EXISTS "{view_name}" AS {view["sql"]}'
+                ))
+                await conn.execute(text(
+                    f'CREATE UNIQUE INDEX IF NOT EXISTS "{view_name}_{view["unique_column"].lower()}_idx" '
+                    f'ON "{view_name}" ("{view["unique_column"]}")'
+                ))
+    
+    async def refresh_compliance_views(self):
+        """Refresh the compliance views without blocking readers
+        
+        Views that do not exist yet are created, which also populates them.
+        """
+        await self.connect()
+        # Refreshes are serialized; the summary view reads the timeline view
+        async with self._refresh_lock:
+            async with self.engine.begin() as conn:
+                result = await conn.execute(text(
+                    "SELECT count(*) FROM pg_matviews WHERE matviewname = ANY(:names)"
+                ), {"names": list(COMPLIANCE_VIEWS)})
+                views_exist = result.scalar() == len(COMPLIANCE_VIEWS)
+            
+            if not views_exist:
+                await self.create_compliance_views()
+                return
+            
+            async with self.engine.begin() as conn:
+                for view_name in COMPLIANCE_VIEWS:
+                    await conn.execute(text(f'REFRESH MATERIALIZED VIEW CONCURRENTLY "{view_name}"'))
+    
+    async def start_compliance_view_refresher(self):
+        """Create the compliance views and keep them refreshed in the background"""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+    
+    async def stop_compliance_view_refresher(self):
+        """Stop the background compliance view refresh"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+    
+    async def _refresh_loop(self):
+        """Periodically refresh the compliance views"""
+        created = False
+        while True:
+            try:
+                if not created:
+                    await self.create_compliance_views()
+                    created = True
+                else:
+                    await self.refresh_compliance_views()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Compliance view refresh failed: {str(e)}")
+            
+            await asyncio.sleep(settings.COMPLIANCE_VIEW_REFRESH_SECONDS)
+    
+    async def get_search_index_validity(self) -> dict:
+        """Map each table with a search index to whether the index is valid
+        
+        A failed concurrent build leaves an index that exists but is invalid.
+        """
+        await self.connect()
+        async with self.engine.begin() as conn:
+            result = await conn.execute(text("""
+                SELECT c.relname, i.indisvalid
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = ANY(:names)
+                  AND pg_table_is_visible(c.oid)
+            """), {"names": [f"{table_name}_search_idx" for table_name in SEARCH_COLUMNS]})
+            validity = {row[0]: row[1] for row in result.fetchall()}
+        
+        return {
+            table_name: validity[f"{table_name}_search_idx"]
+            for table_name in SEARCH_COLUMNS
+            if f"{table_name}_search_idx" in validity
+        }
+    
+    async def create_search_indexes(self):
+        """Create GIN indexes over the free-text columns without locking writes
+        
+        Invalid indexes left by an earlier failed build are dropped and rebuilt.
+        """
+        index_validity = await self.get_search_index_validity()
+        
+        async with self.engine.connect() as conn:
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            for table_name in SEARCH_COLUMNS:
+                if index_validity.get(table_name) is False:
+                    logger.warning(f"Rebuilding invalid search index on {table_name}")
+                    await conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{table_name}_search_idx"'))
+                await conn.execute(text(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{table_name}_search_idx" '
+                    f'ON "{table_name}" USING GIN (({search_vector_sql(table_name)}))'
+                ))
+    
+    async def start_search_index_build(self):
+        """Create the search indexes in the background"""
+        async def build():
+            try:
+                await self.create_search_indexes()
+            except Exception as e:
+                logger.error(f"Failed to create search indexes: {str(e)}")
+        
+        if self._search_index_task is None:
+            self._search_index_task = asyncio.create_task(build())
+    
+    async def search(self, query: str, table_name: str = None, limit: int = 20, match_all: bool = True):
+        """Ranked full-text search over the free-text columns
+        
+        Terms use websearch syntax ("quoted phrases", or, -exclusions). With
+        match_all False any of the words may match.
+        """
+        if table_name is not None and table_name not in SEARCH_COLUMNS:
+            raise ValueError(f"Table {table_name} is not searchable")
+        
+        if not match_all:
+            query = " or ".join(re.findall(r"\w+", query))
+        
+        tables = [table_name] if table_name else list(SEARCH_COLUMNS)
+        await self.connect()
+        results = []
+        
+        async with self.engine.begin() as conn:
+            for table in tables:
+                key = TABLE_KEYS[table]
+                result = await conn.execute(text(f"""
+                    SELECT "{key}", "NAME", "DATE",
+                           ts_rank({search_vector_sql(table)}, q) AS rank,
+                           ts_headline('{SEARCH_LANGUAGE}', {search_document_sql(table)}, q, :headline_options) AS highlight
+                    FROM "{table}", websearch_to_tsquery('{SEARCH_LANGUAGE}', :query) AS q
+                    WHERE {search_vector_sql(table)} @@ q
+                    ORDER BY rank DESC
+                    LIMIT :limit
+                """), {"query": query, "limit": limit, "headline_options": SEARCH_HEADLINE_OPTIONS})
+                
+                for row in result.fetchall():
+                    results.append({
+                        "table_name": table,
+                        "id": row[0],
+                        "name": row[1],
+                        "date": row[2],
+                        "rank": row[3],
+                        "highlight": row[4]
+                    })
+        
+        results.sort(key=lambda item: item["rank"], reverse=True)
+        results = results[:limit]
+        
+        return {
+            "query": query,
+            "results": results,
+            "count": len(results)
+        }
+    
+    def get_data_version(self, table_name: str):
+        """Version of a snapshot table's data, or None when changes are not being tracked"""
+        if not self._listening or not self._triggers_verified or table_name not in TABLE_KEYS:
+            return None
+        return f"{self._data_version_epoch}-{self._data_version}"
+    
+    def add_change_listener(self, callback):
+        """Register an async callback for batched row changes
+        
+        The callback receives {table_name: {"ids": set, "rows": DataFrame}},
+        or None when notifications may have been missed and a full reload
+        is needed.
+        """
+        self._change_listeners.append(callback)
+    
+    async def install_change_triggers(self):
+        """Create the triggers that publish row changes on the listen channel"""
+        await self.connect()
+        async with self.engine.begin() as conn:
+            await conn.execute(text(CHANGE_NOTIFY_FUNCTION_SQL))
+            await conn.execute(text(TRUNCATE_NOTIFY_FUNCTION_SQL))
+            for table_name, key in TABLE_KEYS.items():
+                await conn.execute(text(f'DROP TRIGGER IF EXISTS chatbot_notify_change ON "{table_name}"'))
+                await conn.execute(text(
+                    f'CREATE TRIGGER chatbot_notify_change '
+                    f'AFTER INSERT OR UPDATE OR DELETE ON "{table_name}" '
+                    f"FOR EACH ROW EXECUTE FUNCTION notify_chatbot_data_change('{key}', '{settings.DB_LISTEN_CHANNEL}')"
+                ))
+                await conn.execute(text(f'DROP TRIGGER IF EXISTS chatbot_notify_truncate ON "{table_name}"'))
+                await conn.execute(text(
+                    f'CREATE TRIGGER chatbot_notify_truncate '
+                    f'AFTER TRUNCATE ON "{table_name}" '
+                    f"FOR EACH STATEMENT EXECUTE FUNCTION notify_chatbot_data_truncate('{settings.DB_LISTEN_CHANNEL}')"
+                ))
+    
+    async def verify_change_triggers(self) -> bool:
+        """Check that every snapshot table has enabled change triggers"""
+        await self.connect()
+        async with self.engine.connect() as conn:
+            for table_name in TABLE_KEYS:
+                result = await conn.execute(
+                    text(
+                        "SELECT tgname FROM pg_trigger "
+                        "WHERE tgrelid = to_regclass(:table_name) "
+                        "AND NOT tgisinternal AND tgenabled <> 'D'"
+                    ),
+                    {"table_name": f'"{table_name}"'}
+                )
+                names = {row[0] for row in result}
+                if not set(CHANGE_TRIGGER_NAMES) <= names:
+                    return False
+        return True
+    
+    async def start_change_listener(self):
+        """Start listening for row change notifications in the background"""
+        if self._listen_task is None:
+            self._listen_task = asyncio.create_task(self._listen_loop())
+    
+    async def stop_change_listener(self):
+        """Stop listening for row change notifications"""
+        tasks = [task for task in (self._listen_task, self._flush_task) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._listen_task = None
+        self._flush_task = None
+    
+    async def _listen_loop(self):
+        """Hold a LISTEN connection open, reconnecting when it drops"""
+        import asyncpg
+        
+        dsn = self.db_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+        first_connect = True
+        
+        if settings.DB_LISTEN_INSTALL_TRIGGERS:
+            # Installing needs ownership of the tables; without it, LISTEN still
+            # works if the triggers were installed by someone who has it
+            try:
+                await self.install_change_triggers()
+            except Exception as e:
+                logger.error(
+                    f"Could not install change triggers, listening anyway "
+                    f"(set DB_LISTEN_INSTALL_TRIGGERS=false if they are managed separately): {str(e)}"
+                )
+        
+        while True:
+            try:
+                conn = await asyncpg.connect(dsn)
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: closed.set())
+                await conn.add_listener(settings.DB_LISTEN_CHANNEL, self._on_notification)
+                
+                self._data_version += 1
+                self._listening = True
+                try:
+                    self._triggers_verified = await self.verify_change_triggers()
+                except Exception as e:
+                    logger.error(f"Could not verify change triggers: {str(e)}")
+                    self._triggers_verified = False
+                if not self._triggers_verified:
+                    logger.warning("Change triggers are missing; table ETags fall back to content hashes")
+                
+                # Changes made while disconnected were never delivered
+                if not first_connect:
+                    await self._notify_listeners(None)
+                first_connect = False
+                
+                try:
+                    await closed.wait()
+                finally:
+                    self._listening = False
+                    self._triggers_verified = False
+                    if not conn.is_closed():
+                        await conn.close()
+                
+                logger.warning("Change listener connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Change listener error: {str(e)}")
+            
+            await asyncio.sleep(settings.DB_LISTEN_RECONNECT_SECONDS)
+    
+    def _on_notification(self, connection, pid, channel, payload):
+        """Collect a row change and schedule a debounced flush"""
+        try:
+            change = json.loads(payload)
+            table_name = change["table"]
+            row_id = change["id"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed change notification: {payload}")
+            return
+        
+        if table_name not in TABLE_KEYS:
+            return
+        
+        self._distinct_cache.clear()
+        if change.get("op") == "TRUNCATE":
+            self._data_version += 1
+            self._full_reload_pending = True
+        elif row_id is not None:
+            self._data_version += 1
+            self._pending_changes.setdefault(table_name, set()).add(row_id)
+        else:
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_debounce())
+    
+    async def _flush_after_debounce(self):
+        """Wait for a burst of notifications to settle, then apply them as one batch
+        
+        Keeps flushing until nothing is pending, so notifications that arrive
+        while listeners are busy are not left waiting for the next one.
+        """
+        while self._pending_changes or self._full_reload_pending:
+            await asyncio.sleep(settings.DB_LISTEN_DEBOUNCE_SECONDS)
+            
+            if self._full_reload_pending:
+                # A full reload also covers any row changes collected so far
+                self._full_reload_pending = False
+                self._pending_changes = {}
+                await self._notify_listeners(None)
+                continue
+            
+            pending, self._pending_changes = self._pending_changes, {}
+            changes = {}
+            try:
+                for table_name, ids in pending.items():
+                    rows = await self.fetch_rows_by_key(table_name, list(ids))
+                    changes[table_name] = {"ids": ids, "rows": rows}
+            except Exception as e:
+                logger.error(f"Failed to fetch changed rows: {str(e)}")
+                changes = None
+            
+            await self._notify_listeners(changes)
+    
+    async def _notify_listeners(self, changes):
+        """Pass changes to every registered listener"""
+        for callback in self._change_listeners:
+            try:
+                await callback(changes)
+            except Exception as e:
+                logger.error(f"Change listener callback failed: {str(e)}")
 
 # Create service instance
 database_service = DatabaseService()
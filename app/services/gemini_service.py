@@ -1,7 +1,9 @@
-import httpx
 from app.config import settings
 from app.models.chat import ChatHistory
 
+class GeminiError(Exception):
+    """Gemini did not return a usable response"""
+
 class GeminiService:
     """Simple Gemini service"""
     
@@ -35,6 +37,14 @@ class GeminiService:
             "",
             "Use quotes around column names with uppercase letters.",
             "Example: Use \"RNAO_ASSESSMENT\" instead of RNAO_ASSESSMENT",
+            "",
+            "For questions about late, missed or on-time compliance events, query the",
+            "fall_compliance_timeline or fall_compliance_incident_summary materialized views",
+            "when they are listed in the schema instead of joining fall_compliance_events to",
+            "fall_incidents_primary and computing ACTUAL_TIMESTAMP - SCHEDULED_TIMESTAMP.",
+            "",
+            "For free-text questions (e.g. falls involving wheelchairs), use the FULL-TEXT SEARCH",
+            "expressions from the schema with a few key terms instead of ILIKE '%...%' scans.",
             ""
         ]
         
@@ -55,7 +65,16 @@ class GeminiService:
         return "\n".join(prompt_parts)
     
     async def generate_response(self, history: list) -> str:
-        """Generate response from Gemini API"""
+        """Generate response from Gemini API, returning errors as text"""
+        try:
+            return await self.request_response(history)
+        except GeminiError as e:
+            return str(e)
+        except Exception as e:
+            return f"Error: {str(e)}"
+    
+    async def request_response(self, history: list) -> str:
+        """Generate response from Gemini API, raising GeminiError on failure"""
         # Add system prompt if available
         if self._system_prompt:
             system_history = [ChatHistory(
@@ -71,27 +90,24 @@ class GeminiService:
         
         payload = {"contents": [msg.dict() for msg in history]}
         
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.api_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    text = result.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text")
-                    
-                    if text:
-                        return text
-                    else:
-                        return "Sorry, I couldn't generate a response."
-                else:
-                    return f"API error: {response.status_code}"
-                    
-        except Exception as e:
-            return f"Error: {str(e)}"
+        import httpx
+        
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.post(
+                self.api_url,
+                json=payload,
+                headers={"Content-Type": "application/json"}
+            )
+            
+            if response.status_code != 200:
+                raise GeminiError(f"API error: {response.status_code}")
+            
+            result = response.json()
+            text = result.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text")
+            
+            if not text:
+                raise GeminiError("Sorry, I couldn't generate a response.")
+            return text
     
     def convert_messages_to_gemini_format(self, messages: list) -> list:
         """Convert messages to Gemini format"""
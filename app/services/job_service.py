@@ -0,0 +1,140 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.services.chatbot_service import chatbot_service
+from app.services.profiling_service import profiling_service
+from app.config import settings
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+FINISHED_STATUSES = (COMPLETED, FAILED)
+
+
+class ChatJob:
+    """A chat message processed in the background"""
+
+    def __init__(self, message: str, history: Optional[List] = None, session_id: Optional[str] = None):
+        self.job_id = uuid.uuid4().hex
+        self.message = message
+        self.history = history
+        self.session_id = session_id
+        self.status = QUEUED
+        self.response: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.finished_monotonic: Optional[float] = None
+        # Replaced on every status change so waiters wake up once per change
+        self.updated = asyncio.Event()
+
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def set_status(self, status: str):
+        """Update the status and wake anyone waiting for a change"""
+        self.status = status
+        now = datetime.now().isoformat()
+        if status == RUNNING:
+            self.started_at = now
+        elif status in FINISHED_STATUSES:
+            self.finished_at = now
+            self.finished_monotonic = time.monotonic()
+        updated, self.updated = self.updated, asyncio.Event()
+        updated.set()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "message": self.message,
+            "response": self.response,
+            "error": self.error,
+            "session_id": self.session_id,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class JobService:
+    """Bounded in-process worker pool for long-running chat requests"""
+
+    def __init__(self):
+        self._jobs: Dict[str, ChatJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def _ensure_workers(self):
+        """Start the worker pool on first use"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=settings.JOB_QUEUE_MAX_SIZE)
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker())
+                for _ in range(settings.JOB_WORKERS)
+            ]
+
+    async def _worker(self):
+        """Process queued jobs one at a time"""
+        while True:
+            job = await self._queue.get()
+            try:
+                job.set_status(RUNNING)
+                async with profiling_service.trace(f"job {job.job_id}"):
+                    job.response = await chatbot_service.answer_message(
+                        user_message=job.message,
+                        history=job.history
+                    )
+                job.set_status(COMPLETED)
+            except asyncio.CancelledError:
+                job.error = "Job cancelled"
+                job.set_status(FAILED)
+                raise
+            except Exception as e:
+                job.error = str(e)
+                job.set_status(FAILED)
+            finally:
+                self._queue.task_done()
+                self._evict_expired()
+
+    def _evict_expired(self):
+        """Drop finished jobs older than the result TTL"""
+        cutoff = time.monotonic() - settings.JOB_RESULT_TTL_SECONDS
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_monotonic is not None and job.finished_monotonic < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, message: str, history: Optional[List] = None, session_id: Optional[str] = None) -> ChatJob:
+        """Queue a chat job; raises asyncio.QueueFull when the queue is full"""
+        self._ensure_workers()
+        self._evict_expired()
+
+        job = ChatJob(message, history, session_id)
+        self._queue.put_nowait(job)
+        self._jobs[job.job_id] = job
+        return job
+
+    def get_job(self, job_id: str) -> Optional[ChatJob]:
+        """Get a job by id, or None if unknown or expired"""
+        self._evict_expired()
+        return self._jobs.get(job_id)
+
+    async def stop(self):
+        """Cancel the worker pool"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+# Create service instance
+job_service = JobService()
@@ -0,0 +1,224 @@
+import asyncio
+import contextvars
+import logging
+import secrets
+import time
+import tracemalloc
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from typing import Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Number of tracemalloc statistics kept per memory snapshot
+MEMORY_TOP_STATS = 10
+
+
+class RequestTrace:
+    """Stage timings and SQL recorded while handling one request or job"""
+
+    def __init__(self, label: str, log_slow: bool = True):
+        self.trace_id = uuid.uuid4().hex
+        self.label = label
+        self.log_slow = log_slow
+        self.started_at = datetime.now().isoformat()
+        self.started = time.perf_counter()
+        self.stages = []
+        self.sql = []
+        self.status_code: Optional[int] = None
+
+    def to_dict(self, duration_ms: float) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "label": self.label,
+            "started_at": self.started_at,
+            "duration_ms": duration_ms,
+            "status_code": self.status_code,
+            "stages": self.stages,
+            "sql": self.sql
+        }
+
+
+_current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+
+
+class ProfilingService:
+    """Opt-in profiling: sampling profiles, memory snapshots and a slow-request log"""
+
+    def __init__(self):
+        self._slow_requests = deque(maxlen=settings.PROFILING_MAX_RECORDS)
+        self._memory_snapshots = deque(maxlen=settings.PROFILING_MAX_RECORDS)
+        self._profiles = {}
+        self._profile_order = deque()
+        self._window_lock = asyncio.Lock()
+        self._background_tasks = set()
+
+    def is_authorized(self, token: Optional[str]) -> bool:
+        """Check a profiling token; profiling is disabled when no token is configured"""
+        if not settings.PROFILING_TOKEN or not token:
+            return False
+        return secrets.compare_digest(token, settings.PROFILING_TOKEN)
+
+    # Request traces and the slow-request log
+
+    @asynccontextmanager
+    async def trace(self, label: str, log_slow: bool = True):
+        """Record stages and SQL for the enclosed work, logging it if slow and log_slow is set"""
+        trace = RequestTrace(label, log_slow)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+            self._finish_trace(trace)
+
+    def _finish_trace(self, trace: RequestTrace):
+        duration_ms = round((time.perf_counter() - trace.started) * 1000, 1)
+        if not trace.log_slow or duration_ms < settings.SLOW_REQUEST_THRESHOLD_MS:
+            return
+
+        record = trace.to_dict(duration_ms)
+        self._slow_requests.appendleft(record)
+        logger.warning(f"Slow request {trace.label} took {duration_ms}ms: {record['stages']}")
+
+        if record["sql"]:
+            # EXPLAIN after the response so the slow request is not made slower
+            task = asyncio.create_task(self._explain_sql(record))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+    async def _explain_sql(self, record: dict):
+        """Attach EXPLAIN plans to the SQL of a slow-request record"""
+        from app.services.database_service import database_service
+
+        for entry in record["sql"]:
+            sql_query = entry["sql"].strip().rstrip(";")
+            results = await database_service.execute_sql_query(f"EXPLAIN {sql_query}", entry["params"])
+            if results.get("success"):
+                entry["explain"] = "\n".join(str(row["QUERY PLAN"]) for row in results["data"])
+            else:
+                entry["explain"] = f"EXPLAIN failed: {results.get('error')}"
+
+    @contextmanager
+    def stage(self, name: str, trace_memory: bool = False):
+        """Time a stage of the current trace
+
+        With trace_memory, also records a tracemalloc diff of the stage
+        while tracemalloc is running.
+        """
+        trace = _current_trace.get()
+        snapshot = None
+        if trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            snapshot = tracemalloc.take_snapshot()
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            if trace is not None:
+                trace.stages.append({"name": name, "duration_ms": duration_ms})
+            if snapshot is not None:
+                self._record_memory(name, snapshot)
+
+    def record_sql(self, sql_query: str, params: Optional[dict] = None):
+        """Remember SQL run by the current trace for the slow-request log"""
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.sql.append({"sql": sql_query, "params": params, "explain": None})
+
+    def get_slow_requests(self) -> list:
+        return list(self._slow_requests)
+
+    # tracemalloc snapshots
+
+    def start_memory_tracing(self, frames: int = 10):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop_memory_tracing(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _record_memory(self, name: str, before):
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        stats = after.compare_to(before, "lineno")
+
+        self._memory_snapshots.appendleft({
+            "stage": name,
+            "timestamp": datetime.now().isoformat(),
+            "size_diff_kb": round(sum(stat.size_diff for stat in stats) / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "top": [str(stat) for stat in stats[:MEMORY_TOP_STATS]]
+        })
+
+    def get_memory_snapshots(self) -> dict:
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "snapshots": list(self._memory_snapshots)
+        }
+
+    # Sampling profiles
+
+    def start_request_profiler(self):
+        """Start a sampling profiler that follows the current request across awaits"""
+        from pyinstrument import Profiler
+
+        profiler = Profiler(interval=settings.PROFILING_INTERVAL_SECONDS, async_mode="enabled")
+        profiler.start()
+        return profiler
+
+    def store_profile(self, profile_id: str, label: str, profiler):
+        """Keep a finished profile, evicting the oldest beyond the limit"""
+        self._profiles[profile_id] = {
+            "label": label,
+            "captured_at": datetime.now().isoformat(),
+            "profiler": profiler
+        }
+        self._profile_order.append(profile_id)
+        while len(self._profile_order) > settings.PROFILING_MAX_RECORDS:
+            self._profiles.pop(self._profile_order.popleft(), None)
+
+    async def profile_window(self, seconds: float) -> str:
+        """Profile everything on the event loop for a time window; returns the profile id"""
+        from pyinstrument import Profiler
+
+        async with self._window_lock:
+            profiler = Profiler(interval=settings.PROFILING_INTERVAL_SECONDS, async_mode="disabled")
+            profiler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profiler.stop()
+
+        profile_id = uuid.uuid4().hex
+        self.store_profile(profile_id, f"window {seconds}s", profiler)
+        return profile_id
+
+    def list_profiles(self) -> list:
+        return [
+            {"profile_id": profile_id, "label": profile["label"], "captured_at": profile["captured_at"]}
+            for profile_id, profile in self._profiles.items()
+        ]
+
+    def render_profile(self, profile_id: str, output_format: str = "html") -> Optional[str]:
+        """Render a stored profile as pyinstrument HTML or speedscope JSON"""
+        profile = self._profiles.get(profile_id)
+        if not profile:
+            return None
+
+        profiler = profile["profiler"]
+        if output_format == "speedscope":
+            from pyinstrument.renderers import SpeedscopeRenderer
+            return profiler.output(renderer=SpeedscopeRenderer())
+        return profiler.output_html()
+
+# Create service instance
+profiling_service = ProfilingService()
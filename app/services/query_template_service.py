@@ -0,0 +1,235 @@
+import re
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Columns returned when listing incidents for a resident
+INCIDENT_SUMMARY_COLUMNS = '"ID", "DATE", "TIME", "ROOM", "FLOOR", "INCIDENT_LOCATION", "INJURIES", "CAUSE"'
+
+# Columns returned when listing compliance events
+COMPLIANCE_SUMMARY_COLUMNS = '"EVENT_ID", "INCIDENT_ID", "NAME", "EVENT_TYPE", "SCHEDULED_TIMESTAMP", "ACTUAL_TIMESTAMP", "EVENT_STATUS", "NURSENAME"'
+
+_INCIDENT = r'(?:falls?|incidents?|fall incidents?)'
+_DATE = r'(\d{4}-\d{2}-\d{2})'
+# One to four name-like tokens; capitalisation is checked in _resident_params
+_NAME = r"([a-z][\w.'-]*(?: [a-z][\w.'-]*){0,3})"
+
+# Words that can follow "for" or "did" but are not resident names
+NAME_STOP_WORDS = {
+    "i", "me", "my", "we", "us", "our", "you", "your", "he", "him", "his",
+    "she", "her", "they", "them", "their", "it", "this", "that", "these",
+    "those", "everyone", "everybody", "anyone", "all", "each", "every",
+    "resident", "residents", "patient", "patients", "the", "a", "an",
+    "with", "without", "on", "in", "at", "from", "last", "next",
+    "today", "yesterday", "week", "month", "year", "night", "day", "shift",
+    "floor", "room", "unit", "ward",
+}
+
+
+class QueryTemplate:
+    """A question pattern bound to a parameterized SQL statement
+
+    With fallback_on_empty, a query that returns no rows is not trusted as
+    an answer and the question goes to the LLM instead; fallback_on_zero does
+    the same for a count of zero. known_values maps a parameter to the
+    (table, column) whose values it must match, so a parameter that is not
+    in the data also goes to the LLM.
+    """
+
+    def __init__(self, intent: str, patterns: List[str], sql: str,
+                 build_params: Callable[[re.Match], Optional[dict]],
+                 fallback_on_empty: bool = False, fallback_on_zero: bool = False,
+                 known_values: Optional[Dict[str, Tuple[str, str]]] = None):
+        self.intent = intent
+        self.patterns = [re.compile(p, re.IGNORECASE) for p in patterns]
+        self.sql = sql
+        self.build_params = build_params
+        self.fallback_on_empty = fallback_on_empty
+        self.fallback_on_zero = fallback_on_zero
+        self.known_values = known_values or {}
+
+
+class TemplateMatch:
+    """Result of matching a question against the templates"""
+
+    def __init__(self, intent: str, sql: str, params: dict, fallback_on_empty: bool = False,
+                 fallback_on_zero: bool = False, known_values: Optional[Dict[str, Tuple[str, str]]] = None):
+        self.intent = intent
+        self.sql = sql
+        self.params = params
+        self.fallback_on_empty = fallback_on_empty
+        self.fallback_on_zero = fallback_on_zero
+        self.known_values = known_values or {}
+
+
+def _floor_params(match: re.Match) -> dict:
+    return {"floor": match.group(1).strip()}
+
+
+def _no_params(match: re.Match) -> dict:
+    return {}
+
+
+def _date_range_params(match: re.Match) -> Optional[dict]:
+    try:
+        start = date.fromisoformat(match.group(1))
+        end = date.fromisoformat(match.group(2))
+    except ValueError:
+        return None
+    if end < start:
+        return None
+    # The range is inclusive of the end day
+    return {"start_date": start, "end_date": end + timedelta(days=1)}
+
+
+def _resident_params(match: re.Match) -> Optional[dict]:
+    """Accept only capitalised, name-like tokens such as John Smith or Mary O'Neil"""
+    tokens = match.group(1).split()
+    for token in tokens:
+        if not token[0].isupper() or token.lower().strip(".") in NAME_STOP_WORDS:
+            return None
+    return {"name": " ".join(tokens)}
+
+
+def _status_params(match: re.Match) -> dict:
+    return {"status": match.group(1).strip()}
+
+
+TEMPLATES = [
+    QueryTemplate(
+        intent="incident_count_by_floor",
+        patterns=[
+            rf'how many {_INCIDENT} (?:are there |were there |happened |occurred )?(?:per|by|on each|for each) floor',
+            rf'(?:count|number) of {_INCIDENT} (?:per|by) floor',
+        ],
+        sql=(
+            'SELECT "FLOOR", COUNT(*) AS "INCIDENT_COUNT" '
+            'FROM fall_incidents_primary '
+            'GROUP BY "FLOOR" ORDER BY "INCIDENT_COUNT" DESC'
+        ),
+        build_params=_no_params,
+    ),
+    QueryTemplate(
+        intent="incident_count_on_floor",
+        patterns=[
+            rf'how many {_INCIDENT} (?:are there |were there |happened |occurred )?on floor ([\w-]+)',
+            rf'(?:count|number) of {_INCIDENT} on floor ([\w-]+)',
+        ],
+        sql=(
+            'SELECT COUNT(*) AS "INCIDENT_COUNT" '
+            'FROM fall_incidents_primary '
+            'WHERE "FLOOR" = :floor'
+        ),
+        build_params=_floor_params,
+        # "floor two" or "floor B" may not be how floors are stored
+        known_values={"floor": ("fall_incidents_primary", "FLOOR")},
+    ),
+    QueryTemplate(
+        intent="incident_count_in_date_range",
+        patterns=[
+            rf'how many {_INCIDENT} (?:are there |were there |happened |occurred )?(?:between|from) {_DATE} (?:and|to) {_DATE}',
+            rf'(?:count|number) of {_INCIDENT} (?:between|from) {_DATE} (?:and|to) {_DATE}',
+        ],
+        sql=(
+            'SELECT COUNT(*) AS "INCIDENT_COUNT" '
+            'FROM fall_incidents_primary '
+            'WHERE "DATE" >= :start_date AND "DATE" < :end_date'
+        ),
+        build_params=_date_range_params,
+        # COUNT always returns a row; a zero may mean the range is outside the data
+        fallback_on_zero=True,
+    ),
+    QueryTemplate(
+        intent="incidents_for_resident",
+        patterns=[
+            rf'(?:show|list|get)(?: me)?(?: all)? {_INCIDENT} for (?:resident |patient )?{_NAME}',
+            rf'(?:what|which) {_INCIDENT} (?:did|has|have) (?:resident |patient )?{_NAME} ha(?:d|ve)',
+        ],
+        sql=(
+            f'SELECT {INCIDENT_SUMMARY_COLUMNS} '
+            'FROM fall_incidents_primary '
+            'WHERE "NAME" ILIKE :name '
+            'ORDER BY "DATE" DESC'
+        ),
+        build_params=_resident_params,
+        fallback_on_empty=True,
+    ),
+    QueryTemplate(
+        intent="overdue_compliance_events",
+        patterns=[
+            r'(?:show|list|get)(?: me)?(?: all)? (?:overdue|missed|outstanding) (?:compliance )?events',
+            r'(?:which|what) (?:compliance )?events are overdue',
+        ],
+        sql=(
+            f'SELECT {COMPLIANCE_SUMMARY_COLUMNS} '
+            'FROM fall_compliance_events '
+            'WHERE "ACTUAL_TIMESTAMP" IS NULL AND "SCHEDULED_TIMESTAMP" < now() '
+            'ORDER BY "SCHEDULED_TIMESTAMP"'
+        ),
+        build_params=_no_params,
+    ),
+    QueryTemplate(
+        intent="late_compliance_events",
+        patterns=[
+            r'(?:show|list|get)(?: me)?(?: all)? (?:late|delayed) (?:compliance )?events',
+            r'(?:which|what) (?:compliance )?events were (?:completed |done )?late',
+        ],
+        sql=(
+            f'SELECT {COMPLIANCE_SUMMARY_COLUMNS} '
+            'FROM fall_compliance_events '
+            'WHERE "ACTUAL_TIMESTAMP" > "SCHEDULED_TIMESTAMP" '
+            'ORDER BY "ACTUAL_TIMESTAMP" - "SCHEDULED_TIMESTAMP" DESC'
+        ),
+        build_params=_no_params,
+    ),
+    QueryTemplate(
+        intent="compliance_events_by_status",
+        patterns=[
+            r'(?:show|list|get)(?: me)?(?: all)? (?:compliance )?events with status ([\w-]+)',
+        ],
+        sql=(
+            f'SELECT {COMPLIANCE_SUMMARY_COLUMNS} '
+            'FROM fall_compliance_events '
+            'WHERE "EVENT_STATUS" ILIKE :status '
+            'ORDER BY "SCHEDULED_TIMESTAMP"'
+        ),
+        build_params=_status_params,
+        # The status may not be a value that exists in the data
+        fallback_on_empty=True,
+    ),
+]
+
+
+class QueryTemplateService:
+    """Deterministic intent matcher for common chat questions"""
+
+    def __init__(self, templates: Optional[List[QueryTemplate]] = None):
+        self.templates = templates if templates is not None else TEMPLATES
+
+    def _normalize(self, text: str) -> str:
+        """Collapse whitespace and strip trailing punctuation"""
+        text = re.sub(r'\s+', ' ', text).strip()
+        return text.rstrip('?.! ')
+
+    def match(self, question: str) -> Optional[TemplateMatch]:
+        """Return a template match only when the whole question fits a pattern"""
+        text = self._normalize(question)
+        if not text:
+            return None
+
+        for template in self.templates:
+            for pattern in template.patterns:
+                match = pattern.fullmatch(text)
+                if not match:
+                    continue
+                params = template.build_params(match)
+                if params is None:
+                    continue
+                return TemplateMatch(
+                    template.intent, template.sql, params,
+                    template.fallback_on_empty, template.fallback_on_zero, template.known_values
+                )
+
+        return None
+
+# Create service instance
+query_template_service = QueryTemplateService()
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+from app.services.chatbot_service import chatbot_service
+from app.services.database_service import database_service
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Warm-up stages, in the order they run
+STAGES = ["database_pool", "schema_catalog", "data_snapshot"]
+
+# Stage states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class StartupService:
+    """Warms the app in the background and reports readiness"""
+
+    def __init__(self):
+        self._stages: Dict[str, dict] = {
+            stage: {"status": PENDING, "duration_ms": None, "error": None}
+            for stage in STAGES
+        }
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the warm-up in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._warm_up())
+
+    async def stop(self):
+        """Cancel the warm-up if it is still running"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run_stage(self, stage: str, coro):
+        """Run one warm-up stage, recording its status and duration"""
+        self._stages[stage]["status"] = RUNNING
+        started = time.perf_counter()
+        try:
+            result = await coro
+        except Exception as e:
+            self._stages[stage]["status"] = FAILED
+            self._stages[stage]["error"] = str(e)
+            raise
+        finally:
+            self._stages[stage]["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self._stages[stage]["status"] = DONE
+        return result
+
+    async def _initialize_chatbot(self, schema_data: str):
+        """Build the data snapshot, failing the stage unless every table loaded"""
+        if chatbot_service.is_initialized():
+            # An earlier attempt or request loaded a partial snapshot; fetch it again
+            message = await chatbot_service.reload_data()
+        else:
+            message = await chatbot_service.initialize(schema_data=schema_data)
+        if not chatbot_service.is_initialized():
+            raise RuntimeError(message)
+        
+        missing = chatbot_service.get_missing_tables()
+        if missing:
+            raise RuntimeError(f"Failed to load tables: {', '.join(missing)}")
+
+    async def _warm_up(self):
+        """Warm the pool, schema catalog and data snapshot, retrying until it succeeds"""
+        while True:
+            try:
+                await self._run_stage(
+                    "database_pool",
+                    database_service.warm_pool(settings.DB_POOL_WARM_CONNECTIONS)
+                )
+                schema_data = await self._run_stage(
+                    "schema_catalog",
+                    database_service.get_database_schema(strict=True)
+                )
+                await self._run_stage(
+                    "data_snapshot",
+                    self._initialize_chatbot(schema_data)
+                )
+                logger.info("Warm-up complete")
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Warm-up failed, retrying in {settings.WARMUP_RETRY_SECONDS}s: {str(e)}")
+            
+            await asyncio.sleep(settings.WARMUP_RETRY_SECONDS)
+
+    def is_ready(self) -> bool:
+        """Ready once every table is loaded, whether by warm-up or a request"""
+        if not settings.WARMUP_ENABLED:
+            return True
+        return chatbot_service.is_initialized() and not chatbot_service.get_missing_tables()
+
+    def get_progress(self) -> dict:
+        """Get the status of each warm-up stage"""
+        return {stage: dict(info) for stage, info in self._stages.items()}
+
+# Create service instance
+startup_service = StartupService()
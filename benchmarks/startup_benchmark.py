@@ -0,0 +1,85 @@
+"""Import-time and warm-up benchmark for app startup.
+
+Run from the repository root:
+
+    python -m benchmarks.startup_benchmark
+    python -m benchmarks.startup_benchmark --warmup   # also time the background warm-up against the database
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules that should not be loaded by importing app.main
+HEAVY_MODULES = ["pandas", "numpy", "sqlalchemy", "asyncpg", "httpx"]
+
+IMPORT_SCRIPT = f"""
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{
+    "import_ms": elapsed,
+    "loaded": [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+}}))
+"""
+
+
+def run_import(runs: int) -> None:
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        # A fresh interpreter per run so nothing is cached in sys.modules
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result["import_ms"])
+        loaded = result["loaded"]
+
+    print(f"import app.main: median {statistics.median(timings):.1f}ms, "
+          f"min {min(timings):.1f}ms, max {max(timings):.1f}ms over {runs} runs")
+    print(f"Heavy modules loaded at import: {', '.join(loaded) if loaded else 'none'}")
+
+
+async def run_warmup(timeout: float) -> None:
+    from app.main import app
+    from app.services.startup_service import startup_service
+
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        startup_ms = (time.perf_counter() - started) * 1000
+        print(f"Lifespan startup returned in {startup_ms:.1f}ms")
+
+        deadline = time.perf_counter() + timeout
+        while not startup_service.is_ready() and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+
+        ready_ms = (time.perf_counter() - started) * 1000
+        status = "ready" if startup_service.is_ready() else "NOT ready"
+        print(f"{status} after {ready_ms:.1f}ms")
+        for stage, info in startup_service.get_progress().items():
+            error = f" ({info['error']})" if info["error"] else ""
+            print(f"  {stage:<16} {info['status']:<8} {info['duration_ms']}ms{error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", action="store_true", help="also time the background warm-up")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    run_import(args.runs)
+    if args.warmup:
+        asyncio.run(run_warmup(args.timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Accuracy and latency benchmark for the NL-to-SQL template fast path.
+
+Run from the repository root:
+
+    python -m benchmarks.template_benchmark
+    python -m benchmarks.template_benchmark --execute   # also time the SQL against the database
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.services.query_template_service import query_template_service
+
+# (question, expected intent or None when the question should go to the LLM)
+LABELED_QUESTIONS = [
+    ("How many falls per floor?", "incident_count_by_floor"),
+    ("how many incidents by floor", "incident_count_by_floor"),
+    ("Number of falls by floor", "incident_count_by_floor"),
+    ("How many falls happened on floor 2?", "incident_count_on_floor"),
+    ("how many incidents on floor 3", "incident_count_on_floor"),
+    ("Count of falls on floor B", "incident_count_on_floor"),
+    ("How many falls between 2024-01-01 and 2024-03-31?", "incident_count_in_date_range"),
+    ("How many incidents occurred from 2024-05-01 to 2024-05-31", "incident_count_in_date_range"),
+    ("number of falls between 2024-02-01 and 2024-02-29", "incident_count_in_date_range"),
+    ("Show falls for resident John Smith", "incidents_for_resident"),
+    ("List all incidents for Mary O'Neil", "incidents_for_resident"),
+    ("What falls did Jane Doe have?", "incidents_for_resident"),
+    ("Show falls for Ann-Marie St. Clair", "incidents_for_resident"),
+    ("Show overdue compliance events", "overdue_compliance_events"),
+    ("list missed events", "overdue_compliance_events"),
+    ("Which events are overdue?", "overdue_compliance_events"),
+    ("Show late compliance events", "late_compliance_events"),
+    ("Which compliance events were completed late?", "late_compliance_events"),
+    ("Show me compliance events with status PENDING", "compliance_events_by_status"),
+    ("Which residents fall most often at night?", None),
+    ("Summarize the trend in falls over the last quarter", None),
+    ("How many falls between 2024-03-31 and 2024-01-01?", None),
+    ("Why are falls on floor 2 increasing?", None),
+    ("What interventions work best after a fall in the bathroom?", None),
+    ("Show falls for floor 2 residents with injuries", None),
+    ("Compare compliance between day and night shifts", None),
+    # Near misses the templates used to capture as bogus parameters
+    ("show falls for her", None),
+    ("What falls did they have?", None),
+    ("Show falls for night shift", None),
+    ("List incidents for John Smith last week", None),
+    ("list incidents for residents with injuries", None),
+    ("Show falls for everyone", None),
+    ("Show falls for The Garden Wing", None),
+    ("Show falls for John Michael Andrew Smith Jr", None),
+    ("show falls for john smith", None),
+    ("Show pending events", None),
+    ("Show completed compliance events", None),
+]
+
+
+def run_accuracy(iterations: int) -> None:
+    correct = 0
+    false_positives = 0
+    misses = 0
+    latencies = []
+
+    for question, expected in LABELED_QUESTIONS:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            match = query_template_service.match(question)
+        latencies.append((time.perf_counter() - start) / iterations * 1_000_000)
+
+        actual = match.intent if match else None
+        if actual == expected:
+            correct += 1
+        elif expected is None:
+            false_positives += 1
+            print(f"FALSE POSITIVE: {question!r} -> {actual}")
+        else:
+            misses += 1
+            print(f"MISS: {question!r} expected {expected}, got {actual}")
+
+    total = len(LABELED_QUESTIONS)
+    print(f"Accuracy: {correct}/{total} ({correct / total:.1%})")
+    print(f"False positives: {false_positives}, misses: {misses}")
+    print(f"Match latency: median {statistics.median(latencies):.1f}us, max {max(latencies):.1f}us")
+
+
+async def run_execution() -> None:
+    from app.services.database_service import database_service
+
+    latencies = []
+    for question, expected in LABELED_QUESTIONS:
+        match = query_template_service.match(question)
+        if not match:
+            continue
+        start = time.perf_counter()
+        results = await database_service.execute_sql_query(match.sql, match.params)
+        elapsed = (time.perf_counter() - start) * 1000
+        latencies.append(elapsed)
+        status = "ok" if results.get("success") else f"error: {results.get('error')}"
+        print(f"{elapsed:8.1f}ms  {match.intent:<30} {status}")
+
+    if latencies:
+        print(f"Execution latency: median {statistics.median(latencies):.1f}ms, max {max(latencies):.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--execute", action="store_true", help="also run matched SQL against the database")
+    args = parser.parse_args()
+
+    run_accuracy(args.iterations)
+    if args.execute:
+        asyncio.run(run_execution())
+
+
+if __name__ == "__main__":
+    main()